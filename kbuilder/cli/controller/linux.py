@@ -10,7 +10,11 @@ class LinuxBuildController(ArgparseController):
         stacked_on = 'base'
         stacked_type = 'nested'
         description = 'Build the Linux kernel'
-        arguments = []
+        arguments = [(['--ci'],
+                      dict(help='Always clean before building',
+                           dest='ci_mode',
+                           action='store_true'))
+                    ]
 
     def __init__(self, *args, **kw):
         """Init the controller."""
@@ -36,6 +40,12 @@ class LinuxBuildController(ArgparseController):
         """Build a kernel image."""
         self.builder.build_kbuild_image()
 
+    @expose(help='Build a kbuild image with every compiler',
+            aliases=['all'],)
+    def kernels(self):
+        """Build a kernel image with every compiler."""
+        self.builder.build_all_kbuild_images()
+
     @expose(help='Build a default configuration file')
     def defconfig(self):
         """Build a default configuration file."""
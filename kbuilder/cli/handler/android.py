@@ -1,6 +1,7 @@
 """Handlers for Android."""
 
 import subprocess
+import time
 from pathlib import Path
 
 from kbuilder.cli.handler.linux import LinuxBuildHandler
@@ -28,7 +29,7 @@ class AndroidBuildHandler(LinuxBuildHandler, IAndroidBuild):
             ota = self.kernel.make_ota_package(kbuild_image_dir='boot',
                                                 source_dir=self.ota_source_dir,
                                                 output_dir=self.export_path)
-            self.log.info('created ' + ota)
+            self.log.info('created {}'.format(ota))
 
     def build_kbuild_image(self) -> Path:
         """Build a kbuild image with the default compiler.
@@ -36,16 +37,17 @@ class AndroidBuildHandler(LinuxBuildHandler, IAndroidBuild):
         Returns:
             The Path to the kbuild image if successful, None otherwise
         """
-        self.compiler.set_as_active()
+        self.kernel.compiler = self.compiler
         self.kernel.extra_version = self.compiler.name
         info = 'Compiling {0} with {1}'.format(self.kernel.release_version,
                                                self.compiler)
         self.log.info(info)
-        self.kernel.arch_clean()
+        start = time.perf_counter()
+        self.kernel.arch_clean_if_stale(force=self.ci_mode)
 
         try:
             self.kernel.build_kbuild_image(self.build_log_dir)
-            self.log.info('{0.kbuild_image} created'.format(self.kernel))
+            self._log_kbuild_image_created(start)
             return self.kernel.kbuild_image
 
         except subprocess.CalledProcessError:
@@ -58,5 +60,5 @@ class AndroidBuildHandler(LinuxBuildHandler, IAndroidBuild):
 
     def init(self) -> None:
         "Initialize the build environment."
-        self.compiler.set_as_active()
+        self.kernel.compiler = self.compiler
         self.kernel.prepare()
@@ -1,5 +1,10 @@
 """Handlers for Linux."""
 
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from kbuilder.cli.interface.linux import ILinuxBuild
@@ -28,6 +33,10 @@ class LinuxBuildHandler(ILinuxBuild):
         self.export_path = Path(app.config.get('output', 'export_dir')).expanduser()
         self.export_path.mkdir(parents=True, exist_ok=True)
         self.build_log_dir = Path(app.config.get('general', 'log_dir')).expanduser()
+        if shutil.which('ccache'):
+            ccache_dir = self.build_log_dir.parent / 'ccache'
+            self._kernel.makefile.env.update(CCACHE_DIR=str(ccache_dir),
+                                             CCACHE_MAXSIZE='20G')
         self._db = app.db
         self.log = app.log
 
@@ -39,6 +48,11 @@ class LinuxBuildHandler(ILinuxBuild):
     def products(self):
         return self._products
 
+    @property
+    def ci_mode(self) -> bool:
+        """Whether every build must start from a clean arch directory."""
+        return getattr(self.app.pargs, 'ci_mode', False)
+
     @property
     def compiler(self):
         try:
@@ -49,9 +63,63 @@ class LinuxBuildHandler(ILinuxBuild):
     def build_kbuild_image(self) -> None:
         """Build a kbuild image."""
         self.log.info('Building {0.release_version}'.format(self.kernel))
-        self.kernel.arch_clean()
+        start = time.perf_counter()
+        self.kernel.arch_clean_if_stale(force=self.ci_mode)
         self.kernel.build_kbuild_image(self.build_log_dir)
-        self.log.info('{0.kbuild_image} created'.format(self.kernel))
+        self._log_kbuild_image_created(start)
+
+    def _log_kbuild_image_created(self, start: float) -> None:
+        """Log the kbuild image and the time spent since start.
+
+        Args:
+            start: time.perf_counter() value from when the build began.
+        """
+        minutes, seconds = divmod(int(time.perf_counter() - start), 60)
+        self.log.info('{0.kbuild_image} created in {1}m {2}s'.format(
+                self.kernel, minutes, seconds))
+
+    def build_all_kbuild_images(self) -> None:
+        """Build a kbuild image with every compiler concurrently.
+
+        Each compiler builds out of tree in its own directory under 'out',
+        then the kbuild images are copied to the export directory.
+        """
+        compilers = self.app.compiler_manager.compilers
+        if not compilers:
+            self.log.warning('No compilers found')
+            return
+
+        root = self.kernel.root
+        if (root / '.config').exists() or (root / 'include' / 'config').exists():
+            self.log.error("{} has in-tree build files; run 'make mrproper' "
+                           "before building with every compiler".format(root))
+            return
+
+        # Share the CPUs between the builds instead of oversubscribing them.
+        jobs = max(1, os.cpu_count() // len(compilers))
+        with ThreadPoolExecutor(max_workers=len(compilers)) as executor:
+            futures = {executor.submit(self._build_variant, compiler, jobs): compiler
+                       for compiler in compilers}
+            for future in as_completed(futures):
+                compiler = futures[future]
+                try:
+                    kernel = future.result()
+                except subprocess.CalledProcessError:
+                    self.log.error('Failed to compile with {}'.format(compiler))
+                    continue
+                export_name = '{0.custom_release}-{0.kbuild_image.name}'.format(kernel)
+                shutil.copy(str(kernel.kbuild_image), str(self.export_path / export_name))
+                self.log.info('{0.kbuild_image} created'.format(kernel))
+
+    def _build_variant(self, compiler, jobs: int):
+        """Build a kbuild image with compiler in its own output directory."""
+        kernel = self.kernel.variant(compiler, self.kernel.root / 'out' / compiler.name,
+                                     jobs=jobs)
+        kernel.extra_version = compiler.name
+        self.log.info('Compiling with {}'.format(compiler))
+        kernel.make_defconfig()
+        kernel.build_kbuild_image(self.build_log_dir)
+        return kernel
 
     def build_defconfig(self):
         """Build a defconfig."""
@@ -47,6 +47,11 @@ class ILinuxBuild(CementBaseHandler):
         """Build a compressed kernel image."""
         pass
 
+    @abc.abstractmethod
+    def build_all_kbuild_images(self):
+        """Build a compressed kernel image with every compiler."""
+        pass
+
     @abc.abstractmethod
     def build_defconfig(self):
         """Build the default configuration file."""
@@ -4,7 +4,7 @@ from cement.core.exc import CaughtSignal, FrameworkError
 
 from kbuilder.cli.app import App
 from kbuilder.cli.config_parser import parse_kernel_config
-from kbuilder.core import exc
+from kbuilder.core import exc, linux
 
 # Define the applicaiton object outside of main, as some libraries might wish
 # to import it as a global (rather than passing it into another class/func)
@@ -12,6 +12,7 @@ app = App()
 
 
 def main():
+    linux.clear_root_cache()
     with app:
         try:
             app.hook.register('pre_run', parse_kernel_config)
@@ -2,11 +2,10 @@
 
 import os
 import shutil
+from pathlib import Path
 from subprocess import check_call
 from typing import Optional
 
-from unipath import Path
-
 from kbuilder.core.linux import LinuxKernel
 
 
@@ -39,13 +38,13 @@ class AndroidKernel(LinuxKernel):
         Keyword arguments:
             ramdisk -- the ramdisk image to include in the boot.img file
         """
-        output = '--output {}'.format(self.custom_release)
-        kernel = '--kernel {}'.format(self.kbuild_image)
-        ramdisk = '--ramdisk {}'.format(ramdisk)
-        check_call('mkbootimg {} {} {}'.format(output, kernel, ramdisk), shell=True)
+        check_call(['mkbootimg',
+                    '--output', self.custom_release,
+                    '--kernel', os.fspath(self.kbuild_image),
+                    '--ramdisk', ramdisk])
 
     def make_ota_package(self, *, kbuild_image_dir: Optional[Path]="",
-                         output_dir: Path, source_dir: Path=Path.cwd()) -> Path:
+                         output_dir: Path, source_dir: Optional[Path]=None) -> Path:
         """Create an Over the Air (OTA) package that can be installed via recovery.
 
         Keyword Args:
@@ -56,6 +55,7 @@ class AndroidKernel(LinuxKernel):
         Returns:
             the path to the zip file created.
         """
+        source_dir = Path(source_dir) if source_dir else Path.cwd()
         if kbuild_image_dir:
             shutil.copy(self.kbuild_image.as_posix(), (source_dir / kbuild_image_dir).as_posix())
         archive_path = output_dir / self.custom_release.lower()
@@ -1,8 +1,10 @@
 """Core Compiler abstractions."""
 
+import functools
 import os
-from pathlib import Path
-from typing import Iterable, List, Optional
+import re
+import shutil
+from typing import Iterable, List, Optional, Tuple, Union
 
 from kbuilder.core.arch import Arch
 
@@ -12,42 +14,41 @@ class Compiler(object):
 
     compiler_prefixes = {'aarch64': Arch.arm64, 'arm-eabi': Arch.arm}
 
-    def __init__(self, root: str) -> None:
+    known_binary_prefixes = ('aarch64-linux-android-',
+                             'aarch64-linux-gnu-',
+                             'arm-eabi-')
+
+    def __init__(self, root: Union[str, os.DirEntry]) -> None:
         """Initialize a new Compiler.
 
         Keyword arguments:
-        root -- the root directory of the compiler
+        root -- the root directory of the compiler, or its scandir entry
         """
-        self.root = Path(root)
-        self._name = self.root.name
-        self._compiler_prefix = Path(self.find_compiler_prefix())
+        self.root = os.fspath(root)
+        self._name = os.path.basename(self.root)
+        self._bin_dir_exists = False
+        self._compiler_prefix = self.find_compiler_prefix()
         self._target_arch = self._find_target_arch()
 
+    def __setstate__(self, state: dict) -> None:
+        """Restore a pickled compiler, including ones pickled by older versions."""
+        self.__dict__.update(state)
+        self.root = os.fspath(self.root)
+        if self._compiler_prefix is not None:
+            self._compiler_prefix = os.fspath(self._compiler_prefix)
+        if '_bin_dir_exists' not in state:
+            self._bin_dir_exists = os.path.isdir(os.path.join(self.root, 'bin'))
+
     def __str__(self) -> str:
         """Return the name of the compiler's root directory."""
         return self.name
 
-    def __nonzero__(self) -> bool:
+    def __bool__(self) -> bool:
         """Return whether the compiler is valid.
 
-        A compiler needs a 'bin' directory to be valid.
+        A compiler needs a gcc binary in its 'bin' directory to be valid.
         """
-        return self.root.isdir() and Path(self.root, 'bin').isdir()
-
-    def __enter__(self):
-        """Set this self as the compiler to compile targets."""
-        self.set_as_active()
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """Do not supresses any errors.
-
-        Positional arguments:
-        exc_type -- the type of exception
-        exc_val -- the value of the exception
-        exc_tb -- the traceback of the exception
-        """
-        return False
+        return self._bin_dir_exists and self._compiler_prefix is not None
 
     @property
     def name(self):
@@ -64,25 +65,39 @@ class Compiler(object):
         """The prefix of all binaries of this."""
         return self._compiler_prefix
 
-    def find_compiler_prefix(self) -> str:
+    def find_compiler_prefix(self) -> Optional[str]:
         """Return the prefix of all binaries of this."""
+        bin_dir = os.path.join(self.root, 'bin')
+
+        for binary_prefix in Compiler.known_binary_prefixes:
+            compiler_prefix = os.path.join(bin_dir, binary_prefix)
+            if os.path.isfile(compiler_prefix + 'gcc'):
+                self._bin_dir_exists = True
+                return compiler_prefix
 
-        def find_binaries() -> Iterable:
-            """Return an Iterable of binaries in the compiler's bin folder."""
-            try:
-                return os.scandir(self.root / 'bin')
-            except NotADirectoryError:
-                pass
+        try:
+            binaries = os.scandir(bin_dir)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        self._bin_dir_exists = True
 
-        binaries = find_binaries()
+        # kbuild invokes $(CROSS_COMPILE)gcc, so versioned binaries such as
+        # gcc-7.3 cannot stand in for it.
+        with binaries:
+            return next((entry.path[:-3] for entry in binaries
+                         if entry.name.endswith('gcc') and entry.is_file()), None)
 
-        if not binaries:
-            return ""
+    @property
+    def env_overlay(self) -> dict:
+        """Environment variables that make this the compiler of make.
 
-        for entry in binaries:
-            if entry.name.endswith('gcc'):
-                compiler_prefix = entry.path[:-3]
-                return compiler_prefix
+        Compilations are wrapped with ccache if it is installed.
+        """
+        cross_compile = self.compiler_prefix
+        if shutil.which('ccache'):
+            cross_compile = 'ccache ' + cross_compile
+        return {'CROSS_COMPILE': cross_compile,
+                'SUBARCH': self.target_arch.name}
 
     @staticmethod
     def find(compilers: Iterable, target_name: str) -> List:
@@ -103,16 +118,15 @@ class Compiler(object):
 
     def _find_target_arch(self) -> Arch:
         """Determine the target architecture of the compiler."""
-        prefix = self.compiler_prefix.name
-        for arch_prefix in iter(Compiler.compiler_prefixes):
-            if prefix.startswith(arch_prefix):
-                target_arch = Compiler.compiler_prefixes[arch_prefix]
-                return target_arch
+        if not self.compiler_prefix:
+            return None
+        match = _match_arch_prefix(os.path.basename(self.compiler_prefix))
+        if match:
+            return Compiler.compiler_prefixes[match.group(1)]
 
-    def set_as_active(self):
-        """Set this self as the active compiler to compile with."""
-        os.putenv('CROSS_COMPILE', self.compiler_prefix)
-        os.putenv('SUBARCH', self.target_arch.name)
+
+_match_arch_prefix = re.compile('^({})'.format(
+    '|'.join(map(re.escape, Compiler.compiler_prefixes)))).match
 
 
 def scandir(compiler_dir: str, target_arch: Optional[Arch] = None) -> List:
@@ -129,13 +143,24 @@ def scandir(compiler_dir: str, target_arch: Optional[Arch] = None) -> List:
         If empty, then compilers of any architecture may be returned
         otherwise only compilers with the matching architecture will be
         returned (default None).
+
+    Results are memoized until an entry of compiler_dir is added or removed.
     """
+    compiler_dir = os.fspath(compiler_dir)
+    mtime_ns = os.stat(compiler_dir).st_mtime_ns
+    return list(_scandir_cached(compiler_dir, target_arch, mtime_ns))
+
 
+@functools.lru_cache(maxsize=8)
+def _scandir_cached(compiler_dir: str, target_arch: Optional[Arch],
+                    mtime_ns: int) -> Tuple[Compiler, ...]:
+    """Return the compilers of scandir for one state of compiler_dir."""
     compilers = []
-    entries = sorted(os.scandir(compiler_dir), key=lambda x: x.name)
+    with os.scandir(compiler_dir) as it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
 
     for entry in entries:
-        compiler = Compiler(entry.path)
+        compiler = Compiler(entry)
         if compiler and (not target_arch or compiler.target_arch == target_arch):
             compilers.append(compiler)
-    return compilers
+    return tuple(compilers)
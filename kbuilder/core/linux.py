@@ -1,5 +1,6 @@
 """Core Linux abstractions."""
 
+import hashlib
 import os
 from pathlib import Path
 from typing import Optional
@@ -7,8 +8,16 @@ from typing import Optional
 from cached_property import cached_property
 
 from kbuilder.core.arch import Arch
+from kbuilder.core.gcc import Compiler
 from kbuilder.core.make import Makefile
 
+_root_cache = {}
+
+
+def clear_root_cache() -> None:
+    """Forget every kernel root located by LinuxKernel.find_root."""
+    _root_cache.clear()
+
 
 class LinuxKernel(object):
     """A high level interface for the Linux Kernel.
@@ -28,25 +37,50 @@ class LinuxKernel(object):
                      'tools']
 
     def __init__(self, root: str, *, arch: Arch=None,
-                 defconfig: str='defconfig') -> None:
+                 defconfig: str='defconfig', output_dir: Optional[str]=None) -> None:
         """Initialze a new Kernel.
 
         Args:
             root: kernel root directory.
             arch: kernel architecture.
             defconfig: default configuration file.
+            output_dir: directory for build outputs (default the kernel root).
         """
         self._root = Path(root)
+        self._output_dir = Path(output_dir) if output_dir else None
         self._extra_version = None
         self._defconfig = defconfig
         self._arch = arch
-        self.makefile = Makefile(root)
+        self._compiler = None
+        self.makefile = Makefile(root, output_dir=output_dir)
 
     @property
     def root(self):
         """The absolute path of the kernel root."""
         return self._root
 
+    @property
+    def output_dir(self):
+        """The out of tree build directory, or None if building in tree."""
+        return self._output_dir
+
+    @property
+    def build_root(self):
+        """The directory which receives the build outputs."""
+        return self.output_dir or self.root
+
+    @property
+    def _last_compiler_file(self):
+        return self.build_root / '.kbuilder' / 'last-compiler'
+
+    @property
+    def last_compiler_name(self) -> Optional[str]:
+        """The name of the compiler which last built the kbuild image."""
+        try:
+            return self._last_compiler_file.read_text()
+        except FileNotFoundError:
+            return None
+
     @property
     def name(self):
         """The name of the kernel root directory."""
@@ -60,7 +94,7 @@ class LinuxKernel(object):
     @cached_property
     def release_version(self):
         """Linux kernel version with the local version appended."""
-        return self.makefile.make_output_last_line('kernelrelease')
+        return self._find_release_version()
 
     @cached_property
     def local_version(self):
@@ -95,6 +129,17 @@ class LinuxKernel(object):
         """The architecture of the kernel."""
         return self._arch
 
+    @property
+    def compiler(self):
+        """The cross compiler used to build the kernel."""
+        return self._compiler
+
+    @compiler.setter
+    def compiler(self, compiler: Compiler):
+        """Set compiler and export its environment to make."""
+        self._compiler = compiler
+        self.makefile.env.update(compiler.env_overlay)
+
     @property
     def defconfig(self):
         """The default configuration file.
@@ -106,7 +151,7 @@ class LinuxKernel(object):
     def kbuild_image(self):
         """The absolute path to the compressed kernel image."""
         kbuild_image = LinuxKernel.kbuild_image_name[self.arch]
-        return self.root / 'arch' / self.arch.name / 'boot' / kbuild_image
+        return self.build_root / 'arch' / self.arch.name / 'boot' / kbuild_image
 
     def __enter__(self):
         """Change the current directory the kernel root."""
@@ -119,6 +164,67 @@ class LinuxKernel(object):
         os.chdir(self._prev_dir)
         return False
 
+    def _find_release_version(self) -> str:
+        """Return the kernel release, reusing the result of previous runs.
+
+        The release is stored in the .kbuilder directory of the build root
+        and keyed by the Makefile, include/config/auto.conf, localversion*
+        files and $LOCALVERSION. Without auto.conf, i.e. before
+        `make prepare`, kernelrelease is not valid and is never cached.
+        Releases which depend on the state of the source control are never
+        cached either: those of configs with CONFIG_LOCALVERSION_AUTO, and
+        those made with LOCALVERSION unset, which get a '+' appended unless
+        HEAD is a clean tag.
+        """
+        try:
+            makefile = (self.root / 'Makefile').read_bytes()
+            config = (self.build_root / 'include' / 'config' / 'auto.conf').read_bytes()
+        except FileNotFoundError:
+            return self.makefile.make_output_last_line('kernelrelease')
+
+        environ = self.makefile.environ or os.environ
+        if b'CONFIG_LOCALVERSION_AUTO=y' in config or 'LOCALVERSION' not in environ:
+            return self.makefile.make_output_last_line('kernelrelease')
+
+        key = hashlib.sha256(makefile)
+        key.update(config)
+        for version_dir in sorted({self.root, self.build_root}):
+            for version_file in sorted(version_dir.glob('localversion*')):
+                key.update(version_file.name.encode())
+                key.update(version_file.read_bytes())
+        key.update(environ['LOCALVERSION'].encode())
+        cache_file = self.build_root / '.kbuilder' / ('kernelrelease-' + key.hexdigest())
+        try:
+            return cache_file.read_text()
+        except FileNotFoundError:
+            pass
+
+        release_version = self.makefile.make_output_last_line('kernelrelease')
+        cache_file.parent.mkdir(exist_ok=True)
+        cache_file.write_text(release_version)
+        return release_version
+
+    def variant(self, compiler: Compiler, output_dir: str, *,
+                jobs: Optional[int]=None) -> 'LinuxKernel':
+        """Return a copy of this kernel which builds out of tree.
+
+        Variants share the kernel source but not the build outputs, so
+        variants with distinct output directories can build concurrently.
+        The kernel source itself must be clean (see `make mrproper`).
+
+        Args:
+            compiler: Compiler of the variant.
+            output_dir: Directory to store build outputs of the variant.
+            jobs: Amount of make jobs of the variant (default same as this).
+        """
+        kernel = type(self)(self.root, arch=self.arch, defconfig=self.defconfig,
+                            output_dir=output_dir)
+        kernel.makefile.env.update(self.makefile.env)
+        kernel.makefile.jobs = jobs or self.makefile.jobs
+        kernel.compiler = compiler
+        kernel.extra_version = self.extra_version
+        return kernel
+
     @staticmethod
     def find_root(kernel_sub_directory: str) -> Path:
         """Locate the root of the kernel directory.
@@ -136,19 +242,22 @@ class LinuxKernel(object):
         Raises:
             FileNotFoundError if the kernel root could not be located.
         """
-        def is_kernel_root(path: Path) -> bool:
-            path_dirs = [file.name for file in os.scandir(path)]
-            return all(dir in path_dirs for dir in LinuxKernel.required_dirs)
-
-        def is_system_root(path: Path) -> bool:
-            return path == Path('/')
-
-        path = Path(kernel_sub_directory)
-
-        while not is_system_root(path):
+        def is_kernel_root(path: str) -> bool:
+            return all(os.path.isdir(os.path.join(path, dir))
+                       for dir in LinuxKernel.required_dirs)
+
+        path = os.path.realpath(kernel_sub_directory)
+        try:
+            return _root_cache[path]
+        except KeyError:
+            pass
+
+        cache_key = path
+        while path != '/':
             if is_kernel_root(path):
-                return path
-            path = path.parent
+                _root_cache[cache_key] = Path(path)
+                return _root_cache[cache_key]
+            path = os.path.dirname(path)
 
         raise FileNotFoundError('Kernel root could not be located')
 
@@ -158,8 +267,25 @@ class LinuxKernel(object):
         This form of cleaning is useful for rebuilding the kernel with the same
         Compiler, since only files that were changed will be recompiled.
         """
-        with self:
-            self.makefile.make('archclean')
+        self.makefile.make('archclean')
+
+    def arch_clean_if_stale(self, *, force: bool=False) -> bool:
+        """Run arch_clean unless the last build used the same compiler.
+
+        Objects built by the current compiler are left for kbuild to rebuild
+        incrementally.
+
+        Args:
+            force: Clean regardless of the last compiler, e.g. in CI.
+
+        Returns:
+            True if the arch directory was cleaned.
+        """
+        if (force or self.compiler is None
+                or self.last_compiler_name != self.compiler.name):
+            self.arch_clean()
+            return True
+        return False
 
     def clean(self) -> None:
         """Remove all compiled kernel files.
@@ -167,18 +293,15 @@ class LinuxKernel(object):
         This form of cleaning is useful when switching the compiler to build the
         kernel since all files need to be recompiled.
         """
-        with self:
-            self.makefile.make('clean')
+        self.makefile.make('clean')
 
     def make_defconfig(self) -> None:
         """Make the default configuration file."""
-        with self:
-            self.makefile.make(self.defconfig)
+        self.makefile.make(self.defconfig)
 
     def prepare(self) -> None:
         "Prepare the build environment."
-        with self:
-            self.makefile.make('prepare')
+        self.makefile.make('prepare')
 
     def build_kbuild_image(self, log_dir: Optional[str]=None) -> None:
         """Make the kernel kbuild image.
@@ -191,8 +314,15 @@ class LinuxKernel(object):
         Raises:
             CalledProcessError: If The target fails to build.
         """
-        with self:
-            Path(log_dir).mkdir(exist_ok=True)
-            build_log = Path(log_dir, self.custom_release + '-log.txt')
-            output = self.makefile.make_output('all')
-            build_log.write_text(output)
+        log_dir = Path(self.root, log_dir)
+        log_dir.mkdir(exist_ok=True)
+        build_log = log_dir / (self.custom_release + '-log.txt')
+        # A failed build leaves objects of this compiler behind.
+        try:
+            self._last_compiler_file.unlink()
+        except FileNotFoundError:
+            pass
+        self.makefile.make_to_file('all', str(build_log))
+        if self.compiler:
+            self._last_compiler_file.parent.mkdir(exist_ok=True)
+            self._last_compiler_file.write_text(self.compiler.name)
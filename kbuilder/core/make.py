@@ -12,6 +12,7 @@ Example:
 import os
 from pathlib import Path
 from subprocess import CompletedProcess, check_call, check_output
+from typing import Optional
 
 
 class Makefile(object):
@@ -19,15 +20,21 @@ class Makefile(object):
 
     Properties:
         path: the default path to invoke make command
+        output_dir: optional directory for build outputs (make O=)
+        jobs: the amount of jobs to invoke make with
     """
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, output_dir: Optional[Path]=None,
+                 jobs: int=os.cpu_count()):
         self.path = path
+        self.output_dir = output_dir
+        self.jobs = jobs
+        self.env = {}
         self._prev_path = None
 
     def __enter__(self):
         """Change the current directory the kernel root."""
         self._prev_path = Path.cwd()
-        self.path.chdir()
+        os.chdir(self.path)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -39,23 +46,40 @@ class Makefile(object):
         """Check if the path property is set"""
         return bool(self.path)
 
+    @property
+    def environ(self) -> Optional[dict]:
+        """The environment of make invocations, or None to inherit ours."""
+        if not self.env:
+            return None
+        return {**os.environ, **self.env}
+
     def make(self, *args, **kwargs):
-        return make(*args, directory=self.path, **kwargs)
+        return make(*args, directory=self.path, output_dir=self.output_dir,
+                    jobs=self.jobs, env=self.environ, **kwargs)
 
     def make_output(self, *args, **kwargs) -> str:
-        return make_output(*args, directory=self.path, **kwargs)
+        return make_output(*args, directory=self.path, output_dir=self.output_dir,
+                           jobs=self.jobs, env=self.environ, **kwargs)
+
+    def make_to_file(self, *args, **kwargs) -> None:
+        return make_to_file(*args, directory=self.path, output_dir=self.output_dir,
+                            jobs=self.jobs, env=self.environ, **kwargs)
 
     def make_output_last_line(self, *args, **kwargs) -> str:
-        return make_output_last_line(*args, directory=self.path, **kwargs)
+        return make_output_last_line(*args, directory=self.path, output_dir=self.output_dir,
+                                     jobs=self.jobs, env=self.environ, **kwargs)
 
 
-def make(recipe: str, *, jobs: int=os.cpu_count(), directory:  str='.', **kwargs) -> CompletedProcess:
+def make(recipe: str, *, jobs: int=os.cpu_count(), directory:  str='.',
+         env: Optional[dict]=None, **kwargs) -> CompletedProcess:
     """Execute a make recipe in the shell.
 
     Args:
         recipe: Recipe to invoke.
         jobs: Amount of threads to invoke recipe (default os.cpu_count()).
         directory: The directory to invoke the make command.
+        output_dir: Directory to store build outputs in (default in tree).
+        env: Environment of the make process (default inherit ours).
 
     Raises:
           A CalledProcessError if the recipe is unsuccessful.
@@ -64,16 +88,19 @@ def make(recipe: str, *, jobs: int=os.cpu_count(), directory:  str='.', **kwargs
           A CompletedProcess object.
     """
     command = _format_make_command(recipe, jobs=jobs, directory=directory, **kwargs)
-    return check_call(command, shell=True)
+    return check_call(command, shell=True, env=env)
 
 
-def make_output(recipe: str, *, jobs: int=os.cpu_count(), directory:  str='.', **kwargs) -> str:
+def make_output(recipe: str, *, jobs: int=os.cpu_count(), directory:  str='.',
+                env: Optional[dict]=None, **kwargs) -> str:
     """Execute a make recipe in the shell and return output.
 
     Args:
         recipe: Recipe to invoke.
         jobs: Amount of threads to invoke recipe (default os.cpu_count()).
         directory: The directory to invoke the make command.
+        output_dir: Directory to store build outputs in (default in tree).
+        env: Environment of the make process (default inherit ours).
 
     Raises:
           A CalledProcessError if the recipe is unsuccessful.
@@ -82,7 +109,30 @@ def make_output(recipe: str, *, jobs: int=os.cpu_count(), directory:  str='.', *
           Output of make with trailing whitespace trimmed.
     """
     command = _format_make_command(recipe, jobs=jobs, directory=directory, **kwargs)
-    return check_output(command, shell=True, universal_newlines=True).rstrip()
+    return check_output(command, shell=True, env=env, universal_newlines=True).rstrip()
+
+
+def make_to_file(recipe: str, path: str, *, jobs: int=os.cpu_count(), directory:  str='.',
+                 env: Optional[dict]=None, **kwargs) -> None:
+    """Execute a make recipe in the shell and write its output to a file.
+
+    The output of make is written straight to the file, never buffered
+    in memory.
+
+    Args:
+        recipe: Recipe to invoke.
+        path: File to write the output of make to.
+        jobs: Amount of threads to invoke recipe (default os.cpu_count()).
+        directory: The directory to invoke the make command.
+        output_dir: Directory to store build outputs in (default in tree).
+        env: Environment of the make process (default inherit ours).
+
+    Raises:
+          A CalledProcessError if the recipe is unsuccessful.
+    """
+    command = _format_make_command(recipe, jobs=jobs, directory=directory, **kwargs)
+    with open(path, 'wb') as output:
+        check_call(command, shell=True, env=env, stdout=output)
 
 
 def make_output_last_line(*args, **kwargs) -> str:
@@ -100,5 +150,9 @@ def make_output_last_line(*args, **kwargs) -> str:
     return make_output(*args, **kwargs).split('\n')[-1]
 
 
-def _format_make_command(recipe: str, *, jobs: int, directory:  str) -> str:
-    return 'make {} -j{} -C {} --quiet'.format(recipe, jobs, directory)
+def _format_make_command(recipe: str, *, jobs: int, directory:  str,
+                         output_dir: Optional[str]=None) -> str:
+    command = 'make {} -j{} -C {} --quiet'.format(recipe, jobs, directory)
+    if output_dir:
+        command += ' O={}'.format(output_dir)
+    return command
@@ -17,7 +17,6 @@ setup(name='kbuilder',
           'Natural Language :: English',
           'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
           'Operating System :: POSIX :: Linux',
-          'Programming Language :: Python :: 3.5',
           'Programming Language :: Python :: 3.6',
           'Topic :: Software Development :: Build Tools',
       ],
@@ -27,6 +26,7 @@ setup(name='kbuilder',
       packages=find_packages(exclude=['ez_setup', 'examples', 'tests']),
       include_package_data=True,
       zip_safe=False,
+      python_requires='>=3.6',
       test_suite='nose.collector',
       install_requires=[
           ### Required to build documentation
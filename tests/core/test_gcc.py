@@ -0,0 +1,75 @@
+"""Tests for kbuilder.core.gcc."""
+
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from kbuilder.core.arch import Arch
+from kbuilder.core.gcc import Compiler
+
+
+class FindCompilerPrefixTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bin_dir = os.path.join(self.tmp_dir.name, 'bin')
+        os.mkdir(self.bin_dir)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def touch(self, *names):
+        for name in names:
+            open(os.path.join(self.bin_dir, name), 'w').close()
+
+    def test_unversioned_gcc_is_preferred(self):
+        self.touch('aarch64-elf-gcc-7.3', 'aarch64-elf-gcc-ar', 'aarch64-elf-gcc')
+        compiler = Compiler(self.tmp_dir.name)
+        self.assertTrue(compiler)
+        self.assertEqual(compiler.compiler_prefix,
+                         os.path.join(self.bin_dir, 'aarch64-elf-'))
+        self.assertEqual(compiler.target_arch, Arch.arm64)
+
+    def test_versioned_gcc_only_is_invalid(self):
+        self.touch('aarch64-elf-gcc-7.3', 'aarch64-elf-gcc-ar')
+        self.assertFalse(Compiler(self.tmp_dir.name))
+
+    def test_gcc_directory_is_ignored(self):
+        os.mkdir(os.path.join(self.bin_dir, 'aarch64-elf-gcc'))
+        self.assertFalse(Compiler(self.tmp_dir.name))
+
+    def test_missing_bin_directory_is_invalid(self):
+        os.rmdir(self.bin_dir)
+        self.assertFalse(Compiler(self.tmp_dir.name))
+
+
+class PickleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bin_dir = os.path.join(self.tmp_dir.name, 'bin')
+        os.mkdir(self.bin_dir)
+        open(os.path.join(self.bin_dir, 'aarch64-linux-android-gcc'), 'w').close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        compiler = pickle.loads(pickle.dumps(Compiler(self.tmp_dir.name)))
+        self.assertTrue(compiler)
+        self.assertEqual(compiler.compiler_prefix,
+                         os.path.join(self.bin_dir, 'aarch64-linux-android-'))
+
+    def test_state_of_older_versions(self):
+        compiler = Compiler.__new__(Compiler)
+        compiler.__setstate__({
+            'root': Path(self.tmp_dir.name),
+            '_name': os.path.basename(self.tmp_dir.name),
+            '_compiler_prefix': Path(self.bin_dir, 'aarch64-linux-android-'),
+            '_target_arch': Arch.arm64,
+        })
+        self.assertTrue(compiler)
+        self.assertEqual(compiler.root, self.tmp_dir.name)
+        self.assertEqual(compiler.env_overlay['SUBARCH'], 'arm64')
+        self.assertTrue(compiler.env_overlay['CROSS_COMPILE'].endswith(
+                os.path.join(self.bin_dir, 'aarch64-linux-android-')))
@@ -0,0 +1,107 @@
+"""Tests for kbuilder.core.linux."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from subprocess import CalledProcessError
+from unittest import mock
+
+from kbuilder.core.arch import Arch
+from kbuilder.core.linux import LinuxKernel
+
+
+class FakeCompiler(object):
+    def __init__(self, name):
+        self.name = name
+        self.env_overlay = {'CROSS_COMPILE': name + '-', 'SUBARCH': 'arm64'}
+
+
+class ArchCleanIfStaleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.kernel = LinuxKernel(self.tmp_dir.name, arch=Arch.arm64)
+        self.kernel.release_version = '4.4.0'
+        self.kernel.makefile.make = mock.Mock()
+        self.kernel.makefile.make_to_file = mock.Mock()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def build_with(self, compiler):
+        self.kernel.compiler = compiler
+        cleaned = self.kernel.arch_clean_if_stale()
+        self.kernel.build_kbuild_image('logs')
+        return cleaned
+
+    def test_same_compiler_is_not_cleaned(self):
+        compiler = FakeCompiler('a')
+        self.assertTrue(self.build_with(compiler))
+        self.assertFalse(self.build_with(compiler))
+
+    def test_force_cleans(self):
+        compiler = FakeCompiler('a')
+        self.build_with(compiler)
+        self.assertTrue(self.kernel.arch_clean_if_stale(force=True))
+
+    def test_failed_build_of_other_compiler_forces_clean(self):
+        compiler_a = FakeCompiler('a')
+        self.build_with(compiler_a)
+
+        self.kernel.makefile.make_to_file.side_effect = CalledProcessError(2, 'make')
+        with self.assertRaises(CalledProcessError):
+            self.build_with(FakeCompiler('b'))
+        self.kernel.makefile.make_to_file.side_effect = None
+
+        self.assertTrue(self.build_with(compiler_a))
+
+
+class ReleaseVersionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        (self.root / 'Makefile').write_text('VERSION = 4\n')
+        (self.root / 'include' / 'config').mkdir(parents=True)
+        self.auto_conf = self.root / 'include' / 'config' / 'auto.conf'
+        self.auto_conf.write_text('CONFIG_LOCALVERSION="-test"\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def release_version(self, release, env=None):
+        kernel = LinuxKernel(self.tmp_dir.name, arch=Arch.arm64)
+        kernel.makefile.env.update(env if env is not None else {'LOCALVERSION': ''})
+        kernel.makefile.make_output_last_line = mock.Mock(return_value=release)
+        return kernel.release_version
+
+    def test_release_is_reused(self):
+        self.assertEqual(self.release_version('4.4.0-test'), '4.4.0-test')
+        self.assertEqual(self.release_version('4.4.0-other'), '4.4.0-test')
+
+    def test_localversion_file_invalidates_release(self):
+        self.release_version('4.4.0-test')
+        (self.root / 'localversion-extra').write_text('-extra\n')
+        self.assertEqual(self.release_version('4.4.0-test-extra'), '4.4.0-test-extra')
+
+    def test_make_localversion_invalidates_release(self):
+        self.release_version('4.4.0-test')
+        self.assertEqual(self.release_version('4.4.0-test-env', {'LOCALVERSION': '-env'}),
+                         '4.4.0-test-env')
+
+    def test_release_is_not_cached_before_prepare(self):
+        self.auto_conf.unlink()
+        self.release_version('Error: kernelrelease not valid')
+        self.auto_conf.write_text('CONFIG_LOCALVERSION="-test"\n')
+        self.assertEqual(self.release_version('4.4.0-test'), '4.4.0-test')
+
+    def test_release_is_not_cached_without_localversion(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('LOCALVERSION', None)
+            self.release_version('4.4.0-test+', env={})
+            self.assertEqual(self.release_version('4.4.0-test', env={}), '4.4.0-test')
+
+    def test_release_is_not_cached_with_localversion_auto(self):
+        self.auto_conf.write_text('CONFIG_LOCALVERSION_AUTO=y\n')
+        self.release_version('4.4.0-00001-gabcdef')
+        self.assertEqual(self.release_version('4.4.0-00002-g012345'),
+                         '4.4.0-00002-g012345')